@@ -12,6 +12,7 @@ class Settings(BaseSettings):
     JIRA_BASE_URL: str
     JIRA_EMAIL: str
     JIRA_API_TOKEN: str
+    JIRA_PROJECT_KEY: Optional[str] = None
     
     # Vercel AI
     VERCEL_AI_API_KEY: str
@@ -19,6 +20,9 @@ class Settings(BaseSettings):
     # Configuración de la aplicación
     APP_ENV: str = "development"
     LOG_LEVEL: str = "INFO"
+
+    # Diffs por debajo de este tamaño (en caracteres) no pasan por la IA
+    MIN_DIFF_LENGTH_FOR_AI: int = 200
     
     class Config:
         env_file = ".env"
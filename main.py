@@ -4,29 +4,32 @@ Proporciona endpoints para recibir webhooks de GitHub y generar
 documentación y feedback usando IA.
 """
 
-from fastapi import FastAPI, Request, HTTPException, Header, Depends, status, Query
-from fastapi.responses import JSONResponse
+from fastapi import (
+    FastAPI, Request, HTTPException, Header, Depends, status, Query, BackgroundTasks
+)
+from fastapi.responses import JSONResponse, ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
-import hmac
-import hashlib
-import os
+import asyncio
+import sys
 from dotenv import load_dotenv
-import json
-import re
-from typing import Optional, Dict, Any
+import orjson
+from typing import Dict, Any
 from datetime import datetime
-import requests
 from pydantic import BaseModel
 
 # Importar servicios y utilidades
+from config import settings
 from services.github_service import GitHubService
 from services.jira_service import JiraService
 from services.ai_service import AIService
+from utils.fastpath import extract_jira_id, verify_signature
 from utils.logger import setup_logger
 from utils.rate_limiter import RateLimiter
 
-# Cargar variables de entorno
-load_dotenv()
+# Cargar variables de entorno (solo en desarrollo; en producción ya vienen
+# resueltas en el entorno y parsear el .env solo encarece el cold-start)
+if settings.APP_ENV == "development":
+    load_dotenv()
 
 # Configurar logging
 logger = setup_logger("main")
@@ -35,7 +38,8 @@ logger = setup_logger("main")
 app = FastAPI(
     title="DevSync AI",
     description="API para sincronización entre GitHub y Jira con IA",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # Configurar CORS
@@ -47,24 +51,36 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Inicializar servicios
+# Inicializar servicios (cada variable de entorno se resuelve una sola vez
+# a través del singleton de Settings)
 github_service = GitHubService(
-    webhook_secret=os.getenv("GITHUB_WEBHOOK_SECRET"),
-    api_token=os.getenv("GITHUB_TOKEN")
+    webhook_secret=settings.GITHUB_WEBHOOK_SECRET,
+    api_token=settings.GITHUB_TOKEN,
+    repo=settings.GITHUB_REPO
 )
 
 jira_service = JiraService(
-    base_url=os.getenv("JIRA_BASE_URL"),
-    email=os.getenv("JIRA_EMAIL"),
-    api_token=os.getenv("JIRA_API_TOKEN"),
-    project_key=os.getenv("JIRA_PROJECT_KEY")
+    base_url=settings.JIRA_BASE_URL,
+    email=settings.JIRA_EMAIL,
+    api_token=settings.JIRA_API_TOKEN,
+    project_key=settings.JIRA_PROJECT_KEY
 )
 
-ai_service = AIService(api_key=os.getenv("VERCEL_AI_API_KEY"))
+ai_service = AIService(api_key=settings.VERCEL_AI_API_KEY)
+
+@app.on_event("shutdown")
+async def shutdown_services():
+    """Cierra los clientes HTTP de los servicios al apagar la aplicación."""
+    await github_service.aclose()
+    await jira_service.aclose()
+    await ai_service.aclose()
 
 # Configurar rate limiter
 rate_limiter = RateLimiter(calls=100, period=60)  # 100 requests por minuto
 
+# Secreto del webhook precodificado una sola vez (evita os.getenv + encode por request)
+_WEBHOOK_SECRET_BYTES = settings.GITHUB_WEBHOOK_SECRET.encode()
+
 def verify_github_signature(payload_body: bytes, signature_header: str) -> bool:
     """
     Verifica la firma del webhook de GitHub.
@@ -79,60 +95,114 @@ def verify_github_signature(payload_body: bytes, signature_header: str) -> bool:
     if not signature_header:
         logger.warning("No se proporcionó firma en el webhook")
         return False
-    
-    try:
-        expected_signature = hmac.new(
-            os.getenv("GITHUB_WEBHOOK_SECRET").encode(),
-            payload_body,
-            hashlib.sha256
-        ).hexdigest()
-        
-        is_valid = hmac.compare_digest(
-            f"sha256={expected_signature}",
-            signature_header
-        )
-        
-        if not is_valid:
-            logger.warning("Firma de webhook inválida")
-            
-        return is_valid
-        
-    except Exception as e:
-        logger.error(f"Error al verificar firma: {str(e)}")
-        return False
 
-def extract_jira_id(text: str) -> Optional[str]:
-    """
-    Extrae el ID de Jira de un texto usando regex.
+    is_valid = verify_signature(_WEBHOOK_SECRET_BYTES, payload_body, signature_header)
 
-    Args:
-        text (str): Texto del que extraer el ID
+    if not is_valid:
+        logger.warning("Firma de webhook inválida")
 
-    Returns:
-        Optional[str]: ID de Jira si se encuentra, None en caso contrario
-    """
-    pattern = r'[A-Z]+-\d+'
-    match = re.search(pattern, text)
-    return match.group(0) if match else None
+    return is_valid
 
 async def rate_limit_dependency(request: Request):
     """
     Dependencia para rate limiting.
     """
-    client_ip = request.client.host
-    if not rate_limiter.is_allowed(client_ip):
+    # Internar la IP: los webhooks llegan desde pocos orígenes, así el dict
+    # del limiter reutiliza el hash de la misma str en vez de recalcularlo
+    client_ip = sys.intern(request.client.host)
+    allowed, remaining, reset_in = rate_limiter.check(client_ip)
+    if not allowed:
         raise HTTPException(
             status_code=status.HTTP_429_TOO_MANY_REQUESTS,
             detail={
                 "error": "Rate limit exceeded",
-                "reset_in": f"{rate_limiter.get_reset_time(client_ip):.1f}s",
-                "remaining_calls": rate_limiter.get_remaining_calls(client_ip)
+                "reset_in": f"{reset_in:.1f}s" if reset_in else None,
+                "remaining_calls": remaining
             }
         )
 
+async def _process_branch_created(branch_name: str, jira_id: str) -> None:
+    """
+    Procesa la creación de una rama en segundo plano.
+
+    Args:
+        branch_name (str): Nombre de la rama creada
+        jira_id (str): ID del issue de Jira asociado
+    """
+    try:
+        logger.info(f"Transicionando issue {jira_id} a 'In Progress'")
+        await jira_service.transition_issue(jira_id, "In Progress")
+    except Exception as e:
+        logger.error(f"Error procesando rama {branch_name}: {str(e)}", exc_info=True)
+
+async def _process_pr_opened(pr: Dict[str, Any], jira_id: str) -> None:
+    """
+    Procesa un PR abierto en segundo plano: transiciona el issue y
+    publica feedback generado por IA.
+
+    Args:
+        pr (Dict[str, Any]): Datos del pull request del payload
+        jira_id (str): ID del issue de Jira asociado
+    """
+    try:
+        logger.info(f"Procesando PR abierto para issue {jira_id}")
+        await jira_service.transition_issue(jira_id, "In Review")
+
+        pr_feedback = await ai_service.generate_pr_feedback(
+            pr.get("body", ""),
+            pr.get("title", "")
+        )
+
+        await github_service.add_pr_comment(
+            pr.get("number"),
+            pr_feedback
+        )
+    except Exception as e:
+        logger.error(f"Error procesando PR abierto: {str(e)}", exc_info=True)
+
+async def _process_pr_merged(pr: Dict[str, Any], jira_id: str) -> None:
+    """
+    Procesa un PR mergeado en segundo plano: transiciona el issue y
+    publica la documentación generada por IA.
+
+    Args:
+        pr (Dict[str, Any]): Datos del pull request del payload
+        jira_id (str): ID del issue de Jira asociado
+    """
+    try:
+        logger.info(f"Procesando PR mergeado para issue {jira_id}")
+        await jira_service.transition_issue(jira_id, "Completed")
+
+        pr_diff = await github_service.get_pr_diff(pr.get("number")) or ""
+
+        # Diffs triviales o solo binarios no justifican dos generaciones de
+        # IA: publicar un comentario fijo y terminar
+        if (
+            len(pr_diff) < settings.MIN_DIFF_LENGTH_FOR_AI
+            or ("Binary files " in pr_diff and "@@" not in pr_diff)
+        ):
+            logger.info(f"Diff trivial para issue {jira_id}; se omite la generación con IA")
+            await github_service.add_pr_comment(
+                pr.get("number"),
+                "Cambio menor o solo de archivos binarios: no se genera documentación automática."
+            )
+            return
+
+        # Generar ambas documentaciones en una sola petición al modelo
+        tech_doc, non_tech_doc = await ai_service.generate_both_documents(pr_diff)
+
+        # Publicar documentación
+        await github_service.add_pr_comment(
+            pr.get("number"),
+            f"## Documentación Técnica\n\n{tech_doc}\n\n## Documentación No Técnica\n\n{non_tech_doc}"
+        )
+    except Exception as e:
+        logger.error(f"Error procesando PR mergeado: {str(e)}", exc_info=True)
+
 @app.post("/github/webhook", dependencies=[Depends(rate_limit_dependency)])
 async def github_webhook(
     request: Request,
+    background_tasks: BackgroundTasks,
     x_github_event: str = Header(None),
     x_hub_signature_256: str = Header(None)
 ) -> JSONResponse:
@@ -140,20 +210,25 @@ async def github_webhook(
     Endpoint principal para recibir webhooks de GitHub.
     Maneja eventos de creación de ramas y pull requests.
 
+    Verifica la firma y encola el trabajo pesado (Jira, IA, GitHub) en
+    segundo plano, respondiendo 202 de inmediato para no exceder el
+    timeout de entrega de webhooks de GitHub.
+
     Args:
         request (Request): Request de FastAPI
+        background_tasks (BackgroundTasks): Cola de tareas en segundo plano
         x_github_event (str): Tipo de evento de GitHub
         x_hub_signature_256 (str): Firma del webhook
 
     Returns:
-        JSONResponse: Respuesta con el resultado del procesamiento
+        JSONResponse: Respuesta con el resultado del encolado
 
     Raises:
-        HTTPException: Si hay error en la firma o procesamiento
+        HTTPException: Si hay error en la firma o el payload
     """
     # Leer el cuerpo de la petición
     payload_body = await request.body()
-    
+
     # Verificar la firma
     if not verify_github_signature(payload_body, x_hub_signature_256):
         logger.warning("Intento de acceso con firma inválida")
@@ -161,87 +236,68 @@ async def github_webhook(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid signature"
         )
-    
-    # Parsear el payload
+
+    # Parsear el payload (orjson acepta bytes directamente, sin decode previo)
     try:
-        payload = json.loads(payload_body)
-    except json.JSONDecodeError as e:
+        payload = orjson.loads(payload_body)
+    except orjson.JSONDecodeError as e:
         logger.error(f"Error al parsear payload: {str(e)}")
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid JSON payload"
         )
-    
-    try:
-        if x_github_event == "create" and payload.get("ref_type") == "branch":
-            # Manejar creación de rama
-            branch_name = payload.get("ref")
-            jira_id = extract_jira_id(branch_name)
-            
-            if jira_id:
-                logger.info(f"Transicionando issue {jira_id} a 'In Progress'")
-                await jira_service.update_issue_status(jira_id, "In Progress")
-                
-        elif x_github_event == "pull_request":
-            action = payload.get("action")
-            pr = payload.get("pull_request", {})
-            pr_title = pr.get("title", "")
-            jira_id = extract_jira_id(pr_title)
-            
-            if not jira_id:
-                logger.info("No se encontró ID de Jira en el título del PR")
-                return JSONResponse(
-                    content={"message": "No Jira ID found in PR title"}
-                )
-            
-            if action == "opened":
-                # Manejar PR abierto
-                logger.info(f"Procesando PR abierto para issue {jira_id}")
-                await jira_service.update_issue_status(jira_id, "In Review")
-                
-                pr_feedback = await ai_service.generate_pr_feedback(
-                    pr.get("body", ""),
-                    pr_title
-                )
-                
-                await github_service.create_pr_comment(
-                    pr.get("number"),
-                    pr_feedback
-                )
-                
-            elif action == "closed" and pr.get("merged"):
-                # Manejar PR mergeado
-                logger.info(f"Procesando PR mergeado para issue {jira_id}")
-                await jira_service.update_issue_status(jira_id, "Completed")
-                
-                pr_diff = await github_service.get_pr_diff(pr.get("number"))
-                
-                # Generar documentación
-                tech_doc = await ai_service.generate_document(
-                    pr_diff,
-                    "technical"
-                )
-                non_tech_doc = await ai_service.generate_document(
-                    pr_diff,
-                    "non-technical"
-                )
-                
-                # Publicar documentación
-                await github_service.create_pr_comment(
-                    pr.get("number"),
-                    f"## Documentación Técnica\n\n{tech_doc}\n\n## Documentación No Técnica\n\n{non_tech_doc}"
-                )
-        
-        return JSONResponse(
-            content={"message": "Webhook processed successfully"}
-        )
-        
-    except Exception as e:
-        logger.error(f"Error procesando webhook: {str(e)}", exc_info=True)
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Internal server error"
-        )
+
+    if x_github_event == "create" and payload.get("ref_type") == "branch":
+        # Manejar creación de rama
+        branch_name = payload.get("ref")
+        jira_id = extract_jira_id(branch_name)
+
+        if jira_id:
+            background_tasks.add_task(_process_branch_created, branch_name, jira_id)
+
+    elif x_github_event == "pull_request":
+        action = payload.get("action")
+        pr = payload.get("pull_request", {})
+        jira_id = extract_jira_id(pr.get("title", ""))
+
+        if not jira_id:
+            logger.info("No se encontró ID de Jira en el título del PR")
+            return JSONResponse(
+                content={"message": "No Jira ID found in PR title"}
+            )
+
+        if action == "opened":
+            background_tasks.add_task(_process_pr_opened, pr, jira_id)
+        elif action == "closed" and pr.get("merged"):
+            background_tasks.add_task(_process_pr_merged, pr, jira_id)
+
+    return JSONResponse(
+        status_code=status.HTTP_202_ACCEPTED,
+        content={"message": "Webhook accepted"}
+    )
+
+# Respuesta de health precalculada: el timestamp se refresca a 1 Hz en una
+# tarea de fondo en vez de formatear un datetime en cada sondeo del balanceador
+_CACHED_HEALTH: Dict[str, Any] = {
+    "status": "healthy",
+    "timestamp": datetime.utcnow().isoformat(),
+    "services": {
+        "github": "ok",
+        "jira": "ok",
+        "ai": "ok"
+    }
+}
+
+async def _refresh_health_timestamp() -> None:
+    """Refresca el timestamp del health check una vez por segundo."""
+    while True:
+        _CACHED_HEALTH["timestamp"] = datetime.utcnow().isoformat()
+        await asyncio.sleep(1.0)
+
+@app.on_event("startup")
+async def start_health_refresher():
+    """Lanza la tarea de refresco del health check."""
+    asyncio.create_task(_refresh_health_timestamp())
 
 @app.get("/health")
 async def health_check() -> Dict[str, Any]:
@@ -252,15 +308,7 @@ async def health_check() -> Dict[str, Any]:
     Returns:
         Dict[str, Any]: Estado de los servicios
     """
-    return {
-        "status": "healthy",
-        "timestamp": datetime.utcnow().isoformat(),
-        "services": {
-            "github": "ok",
-            "jira": "ok",
-            "ai": "ok"
-        }
-    }
+    return _CACHED_HEALTH
 
 @app.get("/jira/projects")
 async def list_jira_projects():
@@ -268,7 +316,7 @@ async def list_jira_projects():
     Devuelve la lista de proyectos activos de Jira.
     """
     try:
-        projects = jira_service.get_projects()
+        projects = await jira_service.get_projects()
         return {"projects": projects}
     except Exception as e:
         logger.error(f"Error al obtener proyectos de Jira: {str(e)}")
@@ -281,9 +329,9 @@ async def jira_me():
     """
     try:
         url = f"{jira_service.base_url}/rest/api/3/myself"
-        response = requests.get(url, headers=jira_service.headers, auth=jira_service.auth)
+        response = await jira_service._client.get(url)
         response.raise_for_status()
-        return response.json()
+        return orjson.loads(response.content)
     except Exception as e:
         logger.error(f"Error al obtener usuario de Jira: {str(e)}")
         raise HTTPException(status_code=500, detail="Error al obtener usuario de Jira")
@@ -296,9 +344,9 @@ async def get_jira_issues(project_key: str = Query(..., description="Clave del p
     try:
         jql = f"project={project_key} AND statusCategory!=Done"
         url = f"{jira_service.base_url}/rest/api/3/search?jql={jql}"
-        response = requests.get(url, headers=jira_service.headers, auth=jira_service.auth)
+        response = await jira_service._client.get(url)
         response.raise_for_status()
-        return response.json()
+        return orjson.loads(response.content)
     except Exception as e:
         logger.error(f"Error al obtener issues de Jira: {str(e)}")
         raise HTTPException(status_code=500, detail="Error al obtener issues de Jira")
@@ -309,10 +357,8 @@ async def get_issue_transitions(issue_key: str):
     Devuelve las transiciones posibles de un issue Jira.
     """
     try:
-        url = f"{jira_service.base_url}/rest/api/3/issue/{issue_key}/transitions"
-        response = requests.get(url, headers=jira_service.headers, auth=jira_service.auth)
-        response.raise_for_status()
-        return response.json()
+        transitions = await jira_service.get_issue_transitions(issue_key)
+        return {"transitions": transitions}
     except Exception as e:
         logger.error(f"Error al obtener transiciones de Jira: {str(e)}")
         raise HTTPException(status_code=500, detail="Error al obtener transiciones de Jira")
@@ -326,11 +372,8 @@ async def transition_issue(issue_key: str, body: TransitionRequest):
     Cambia el status de un issue Jira al status_id indicado.
     """
     try:
-        url = f"{jira_service.base_url}/rest/api/3/issue/{issue_key}/transitions"
-        payload = {"transition": {"id": body.status_id}}
-        response = requests.post(url, headers=jira_service.headers, auth=jira_service.auth, json=payload)
-        response.raise_for_status()
-        return {"message": "Transición realizada con éxito", "response": response.json()}
+        response = await jira_service.update_issue_status(issue_key, body.status_id)
+        return {"message": "Transición realizada con éxito", "response": response}
     except Exception as e:
         logger.error(f"Error al transicionar issue en Jira: {str(e)}")
         raise HTTPException(status_code=500, detail="Error al transicionar issue en Jira")
@@ -4,9 +4,15 @@ Proporciona funcionalidades para generar feedback de PRs y documentación
 técnica/no técnica usando IA.
 """
 
+import asyncio
+import functools
+import hashlib
 import os
-import requests
+import time
+import httpx
 import logging
+import orjson
+from collections import OrderedDict
 from typing import Optional, Dict, Any, Literal
 from utils.logger import setup_logger
 from utils.rate_limiter import RateLimiter
@@ -14,6 +20,174 @@ from fastapi import HTTPException, status
 
 logger = setup_logger(__name__)
 
+# El coste y la latencia del modelo escalan con tokens, no con caracteres.
+# Si tiktoken está disponible se trunca por tokens reales; si no, se
+# aproxima por caracteres (~4 por token).
+try:
+    import tiktoken
+    _TOKEN_ENCODER = tiktoken.get_encoding("cl100k_base")
+except Exception:  # ImportError o fallo al cargar la codificación
+    _TOKEN_ENCODER = None
+
+_CHARS_PER_TOKEN = 4
+
+def _count_tokens(text: str) -> int:
+    """Cuenta tokens del texto (aproximado por caracteres sin tiktoken)."""
+    if _TOKEN_ENCODER is not None:
+        return len(_TOKEN_ENCODER.encode(text))
+    return len(text) // _CHARS_PER_TOKEN
+
+def _truncate_tokens(text: str, max_tokens: int) -> str:
+    """Recorta el texto al presupuesto de tokens indicado."""
+    if _TOKEN_ENCODER is not None:
+        tokens = _TOKEN_ENCODER.encode(text)
+        return _TOKEN_ENCODER.decode(tokens[:max_tokens])
+    return text[:max_tokens * _CHARS_PER_TOKEN]
+
+# Preambulos estáticos de los prompts. Se mantienen como constantes de módulo
+# para no reconstruir el literal en cada llamada y para que el prefijo sea
+# byte-idéntico entre peticiones (lo que permite a proveedores con caché de
+# prefijo de prompt reutilizar su KV cache).
+_PR_FEEDBACK_PREAMBLE = """Como experto en revisión de código, analiza el siguiente Pull Request y proporciona feedback constructivo y detallado.
+
+Por favor, proporciona un análisis estructurado que incluya:
+
+1. Resumen de Cambios
+   - Principales modificaciones realizadas
+   - Alcance del cambio
+   - Impacto en el sistema
+
+2. Análisis Técnico
+   - Calidad del código
+   - Patrones de diseño utilizados
+   - Posibles problemas de rendimiento o seguridad
+   - Sugerencias de optimización
+
+3. Buenas Prácticas
+   - Aspectos positivos del código
+   - Ejemplos de buenas prácticas implementadas
+   - Reconocimiento de decisiones técnicas acertadas
+
+4. Áreas de Mejora
+   - Sugerencias específicas para mejorar el código
+   - Alternativas o mejores prácticas recomendadas
+   - Consideraciones para futuras iteraciones
+
+5. Preguntas y Dudas
+   - Puntos que requieren aclaración
+   - Decisiones técnicas que podrían necesitar justificación
+   - Consideraciones para el equipo
+
+Formato: Usa markdown para estructurar tu respuesta, incluyendo:
+- Encabezados para cada sección
+- Listas con viñetas para puntos específicos
+- Bloques de código cuando sea relevante
+- Énfasis en puntos importantes usando **negrita** o *cursiva*
+
+Nota: Sé específico y constructivo en tus comentarios, proporcionando ejemplos concretos cuando sea posible."""
+
+_TECH_DOC_PREAMBLE = """Como arquitecto de software senior, genera documentación técnica detallada basada en los cambios de código incluidos al final.
+
+La documentación debe incluir:
+
+1. Descripción Técnica
+   - Arquitectura y diseño implementado
+   - Patrones y principios aplicados
+   - Flujo de datos y control
+   - Dependencias y relaciones
+
+2. Impacto en el Sistema
+   - Cambios en la arquitectura
+   - Modificaciones en APIs o interfaces
+   - Efectos en el rendimiento
+   - Consideraciones de escalabilidad
+
+3. Consideraciones de Implementación
+   - Requisitos técnicos
+   - Configuración necesaria
+   - Pasos de implementación
+   - Pruebas requeridas
+
+4. Efectos Secundarios y Riesgos
+   - Posibles problemas de rendimiento
+   - Consideraciones de seguridad
+   - Impacto en otras partes del sistema
+   - Plan de mitigación de riesgos
+
+5. Mantenimiento y Evolución
+   - Recomendaciones para mantenimiento
+   - Puntos de extensión
+   - Consideraciones para futuras mejoras
+   - Métricas y monitoreo
+
+Formato: Usa markdown para estructurar la documentación, incluyendo:
+- Diagramas en formato Mermaid cuando sea relevante
+- Ejemplos de código en bloques
+- Tablas para comparaciones o configuraciones
+- Enlaces a documentación relacionada
+
+Nota: La documentación debe ser clara, concisa y útil para desarrolladores técnicos."""
+
+_NON_TECH_DOC_PREAMBLE = """Como consultor de negocio y tecnología, genera documentación no técnica (para stakeholders) basada en los cambios incluidos al final.
+
+La documentación debe incluir:
+
+1. Resumen Ejecutivo
+   - Objetivo principal del cambio
+   - Beneficios clave
+   - Impacto en el negocio
+   - Timeline y entregables
+
+2. Beneficios para el Negocio
+   - Mejoras en eficiencia
+   - Reducción de costos
+   - Nuevas capacidades
+   - Ventajas competitivas
+
+3. Impacto en los Usuarios
+   - Cambios en la experiencia de usuario
+   - Nuevas funcionalidades
+   - Mejoras en usabilidad
+   - Plan de adopción
+
+4. Consideraciones Estratégicas
+   - Alineación con objetivos de negocio
+   - Riesgos y mitigación
+   - Oportunidades futuras
+   - Recursos necesarios
+
+5. Próximos Pasos
+   - Plan de implementación
+   - Roles y responsabilidades
+   - Métricas de éxito
+   - Timeline y hitos
+
+Formato: Usa markdown para estructurar la documentación, incluyendo:
+- Gráficos o diagramas cuando sea relevante
+- Puntos clave resaltados
+- Ejemplos prácticos
+- Métricas y KPIs
+
+Nota: La documentación debe ser clara y accesible para stakeholders no técnicos, evitando jerga técnica innecesaria."""
+
+# Prompt combinado: pide ambas documentaciones en una sola generación,
+# delimitadas por centinelas para poder separarlas de la respuesta.
+_BOTH_DOCS_PREAMBLE = f"""Genera DOS documentaciones para los cambios de código incluidos al final. Devuelve cada una envuelta EXACTAMENTE entre sus delimitadores, sin texto fuera de ellos:
+
+[TECH]
+{_TECH_DOC_PREAMBLE}
+[/TECH]
+
+[NONTECH]
+{_NON_TECH_DOC_PREAMBLE}
+[/NONTECH]"""
+
+# Versión derivada de las plantillas: cambia sola cuando se edita cualquier
+# preámbulo, invalidando las entradas cacheadas con la versión anterior
+_PROMPT_VERSION = hashlib.sha256(
+    (_PR_FEEDBACK_PREAMBLE + _TECH_DOC_PREAMBLE + _NON_TECH_DOC_PREAMBLE).encode()
+).hexdigest()[:8]
+
 class AIServiceError(Exception):
     """Excepción base para errores del servicio de IA."""
     pass
@@ -22,31 +196,74 @@ class ContentTooLargeError(AIServiceError):
     """Excepción para cuando el contenido excede el límite permitido."""
     pass
 
+def translate_http_errors(fn):
+    """
+    Decorador que traduce errores de httpx a HTTPException una sola vez,
+    en lugar de repetir los mismos bloques except en cada método. Las
+    HTTPException ya levantadas (p. ej. el 429 del rate limiter) pasan
+    sin retraducir.
+    """
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        try:
+            return await fn(*args, **kwargs)
+        except HTTPException:
+            raise
+        except httpx.TimeoutException:
+            logger.error("Timeout al llamar a la API de IA")
+            raise HTTPException(
+                status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+                detail="La API de IA no respondió a tiempo"
+            )
+        except httpx.HTTPError as e:
+            logger.error(f"Error al llamar a la API de IA: {str(e)}")
+            raise HTTPException(
+                status_code=status.HTTP_502_BAD_GATEWAY,
+                detail="Error al comunicarse con la API de IA"
+            )
+        except Exception as e:
+            logger.error(f"Error inesperado en el servicio de IA: {str(e)}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Error interno del servidor"
+            )
+    return wrapper
+
 class AIService:
     """
     Servicio para interactuar con la API de Vercel AI Gateway.
     
     Attributes:
-        MAX_PR_DESCRIPTION_LENGTH (int): Límite de caracteres para descripción de PR
-        MAX_PR_TITLE_LENGTH (int): Límite de caracteres para título de PR
-        MAX_DIFF_LENGTH (int): Límite de caracteres para diff
+        MAX_PR_DESCRIPTION_TOKENS (int): Límite de tokens para descripción de PR
+        MAX_PR_TITLE_TOKENS (int): Límite de tokens para título de PR
+        MAX_DIFF_TOKENS (int): Límite de tokens para diff
         api_key (str): API key de Vercel AI
         base_url (str): URL base de la API
         rate_limiter (RateLimiter): Instancia del rate limiter
     """
 
-    # Límites de tamaño en caracteres
-    MAX_PR_DESCRIPTION_LENGTH = 4000
-    MAX_PR_TITLE_LENGTH = 200
-    MAX_DIFF_LENGTH = 8000
+    # Límites de tamaño en tokens del modelo
+    MAX_PR_DESCRIPTION_TOKENS = 1000
+    MAX_PR_TITLE_TOKENS = 50
+    MAX_DIFF_TOKENS = 2000
+
+    # Caché exacta de respuestas: tamaño máximo y TTL en segundos
+    RESPONSE_CACHE_SIZE = 256
+    RESPONSE_CACHE_TTL = 24 * 3600
     
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None
+    ):
         """
         Inicializa el servicio de IA.
 
         Args:
             api_key (Optional[str]): API key de Vercel AI. Si no se proporciona,
                                    se busca en variables de entorno.
+            transport (Optional[httpx.AsyncBaseTransport]): Transporte HTTP
+                alternativo; lo usan los tests para inyectar MockTransport
 
         Raises:
             ValueError: Si no se encuentra la API key
@@ -58,13 +275,44 @@ class AIService:
         self.base_url = "https://api.vercel.com/v1/ai"
         self.headers = {
             "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json"
+            "Content-Type": "application/json",
+            # Con el paquete brotli instalado, httpx negocia y descomprime
+            # "br" de forma transparente (~20-30% menos bytes por respuesta)
+            "Accept-Encoding": "gzip, br"
         }
         
+        # Cliente HTTP asíncrono compartido entre todas las peticiones.
+        # Mantiene el pool de conexiones (y la sesión TLS) vivo entre llamadas
+        # y habilita HTTP/2 para multiplexar peticiones concurrentes.
+        self._client = httpx.AsyncClient(
+            base_url=self.base_url,
+            headers=self.headers,
+            timeout=httpx.Timeout(30.0, connect=5.0),
+            transport=transport or httpx.AsyncHTTPTransport(
+                http2=True,
+                limits=httpx.Limits(max_keepalive_connections=20, max_connections=100)
+            )
+        )
+
+        # Caché LRU exacta de respuestas de la IA, clave sha256(versión + prompt)
+        # con TTL. Evita repetir la llamada al LLM (segundos y tokens
+        # facturados) cuando GitHub reentrega un webhook o el prompt se repite.
+        self._response_cache: OrderedDict[str, tuple] = OrderedDict()
+        self._response_cache_lock = asyncio.Lock()
+
         # Configurar rate limiter
         self.rate_limiter = RateLimiter(calls=10, period=60)  # 10 llamadas por minuto
+
+        # Límite de peticiones de IA en vuelo: una ráfaga de webhooks no
+        # debe abrir decenas de llamadas de 30s en paralelo
+        self._sem = asyncio.Semaphore(int(os.getenv("AI_MAX_CONCURRENCY", "8")))
         logger.info("AIService inicializado")
+
+    async def aclose(self) -> None:
+        """Cierra el cliente HTTP asíncrono."""
+        await self._client.aclose()
     
+    @translate_http_errors
     async def _make_ai_request(
         self,
         prompt: str,
@@ -85,54 +333,56 @@ class AIService:
         Raises:
             HTTPException: Si hay error en la petición
         """
-        try:
+        cache_key = hashlib.sha256(
+            (_PROMPT_VERSION + prompt).encode()
+        ).hexdigest()
+        now = time.monotonic()
+
+        async with self._response_cache_lock:
+            cached = self._response_cache.get(cache_key)
+            if cached is not None:
+                text, expires_at = cached
+                if now < expires_at:
+                    self._response_cache.move_to_end(cache_key)
+                    logger.info("Respuesta de IA servida desde caché")
+                    return text
+                del self._response_cache[cache_key]
+
+        async with self._sem:
             # Verificar rate limit
             if not self.rate_limiter.is_allowed("ai_service"):
                 raise HTTPException(
                     status_code=status.HTTP_429_TOO_MANY_REQUESTS,
                     detail="Rate limit exceeded for AI service"
                 )
-            
-            # Realizar petición
-            response = requests.post(
-                f"{self.base_url}/generate",
-                headers=self.headers,
-                json={
+
+            # Realizar petición sin bloquear el event loop
+            response = await self._client.post(
+                "/generate",
+                content=orjson.dumps({
                     "prompt": prompt,
                     "max_tokens": max_tokens,
                     "temperature": temperature
-                },
-                timeout=30  # Timeout de 30 segundos
+                })
             )
-            
-            # Manejar errores HTTP
-            response.raise_for_status()
-            
-            result = response.json().get("text", "")
-            if not result:
-                logger.warning("La API de IA devolvió una respuesta vacía")
-                return "No se pudo generar una respuesta. Por favor, intenta de nuevo."
-            
-            return result
-            
-        except requests.exceptions.Timeout:
-            logger.error("Timeout al llamar a la API de IA")
-            raise HTTPException(
-                status_code=status.HTTP_504_GATEWAY_TIMEOUT,
-                detail="La API de IA no respondió a tiempo"
-            )
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Error al llamar a la API de IA: {str(e)}")
-            raise HTTPException(
-                status_code=status.HTTP_502_BAD_GATEWAY,
-                detail="Error al comunicarse con la API de IA"
-            )
-        except Exception as e:
-            logger.error(f"Error inesperado en el servicio de IA: {str(e)}")
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Error interno del servidor"
+
+        # Manejar errores HTTP
+        response.raise_for_status()
+
+        result = orjson.loads(response.content).get("text", "")
+        if not result:
+            logger.warning("La API de IA devolvió una respuesta vacía")
+            return "No se pudo generar una respuesta. Por favor, intenta de nuevo."
+
+        async with self._response_cache_lock:
+            self._response_cache[cache_key] = (
+                result,
+                time.monotonic() + self.RESPONSE_CACHE_TTL
             )
+            if len(self._response_cache) > self.RESPONSE_CACHE_SIZE:
+                self._response_cache.popitem(last=False)
+
+        return result
     
     async def generate_pr_feedback(
         self,
@@ -154,55 +404,21 @@ class AIService:
         Raises:
             HTTPException: Si hay error en la petición
         """
-        # Validar tamaño de entrada
-        if len(description) > self.MAX_PR_DESCRIPTION_LENGTH:
+        # Normalizar la cola variable: los reintentos tras rebases o ediciones
+        # de espacios producen el mismo prompt y reutilizan la caché exacta
+        description = description.strip()
+        title = title.strip()
+
+        # Validar tamaño de entrada (en tokens)
+        if _count_tokens(description) > self.MAX_PR_DESCRIPTION_TOKENS:
             logger.warning(f"Descripción de PR demasiado larga: {len(description)} caracteres")
-            description = description[:self.MAX_PR_DESCRIPTION_LENGTH] + "..."
-        
-        if len(title) > self.MAX_PR_TITLE_LENGTH:
+            description = _truncate_tokens(description, self.MAX_PR_DESCRIPTION_TOKENS) + "..."
+
+        if _count_tokens(title) > self.MAX_PR_TITLE_TOKENS:
             logger.warning(f"Título de PR demasiado largo: {len(title)} caracteres")
-            title = title[:self.MAX_PR_TITLE_LENGTH] + "..."
+            title = _truncate_tokens(title, self.MAX_PR_TITLE_TOKENS) + "..."
         
-        prompt = f"""Como experto en revisión de código, analiza el siguiente Pull Request y proporciona feedback constructivo y detallado:
-
-Título: {title}
-Descripción: {description}
-
-Por favor, proporciona un análisis estructurado que incluya:
-
-1. Resumen de Cambios
-   - Principales modificaciones realizadas
-   - Alcance del cambio
-   - Impacto en el sistema
-
-2. Análisis Técnico
-   - Calidad del código
-   - Patrones de diseño utilizados
-   - Posibles problemas de rendimiento o seguridad
-   - Sugerencias de optimización
-
-3. Buenas Prácticas
-   - Aspectos positivos del código
-   - Ejemplos de buenas prácticas implementadas
-   - Reconocimiento de decisiones técnicas acertadas
-
-4. Áreas de Mejora
-   - Sugerencias específicas para mejorar el código
-   - Alternativas o mejores prácticas recomendadas
-   - Consideraciones para futuras iteraciones
-
-5. Preguntas y Dudas
-   - Puntos que requieren aclaración
-   - Decisiones técnicas que podrían necesitar justificación
-   - Consideraciones para el equipo
-
-Formato: Usa markdown para estructurar tu respuesta, incluyendo:
-- Encabezados para cada sección
-- Listas con viñetas para puntos específicos
-- Bloques de código cuando sea relevante
-- Énfasis en puntos importantes usando **negrita** o *cursiva*
-
-Nota: Sé específico y constructivo en tus comentarios, proporcionando ejemplos concretos cuando sea posible."""
+        prompt = f"{_PR_FEEDBACK_PREAMBLE}\n\nTítulo: {title}\nDescripción: {description}"
 
         logger.info(f"Generando feedback para PR: {title}")
         return await self._make_ai_request(prompt, max_tokens=max_tokens)
@@ -229,100 +445,69 @@ Nota: Sé específico y constructivo en tus comentarios, proporcionando ejemplos
             HTTPException: Si hay error en la petición
         """
         # Validar tamaño de contenido
-        if len(content) > self.MAX_DIFF_LENGTH:
+        if _count_tokens(content) > self.MAX_DIFF_TOKENS:
             logger.warning(f"Diff demasiado grande: {len(content)} caracteres")
             raise ContentTooLargeError(
-                f"El diff excede el límite de {self.MAX_DIFF_LENGTH} caracteres"
+                f"El diff excede el límite de {self.MAX_DIFF_TOKENS} tokens"
             )
         
-        if doc_type == "technical":
-            prompt = f"""Como arquitecto de software senior, genera documentación técnica detallada basada en los siguientes cambios de código:
+        preamble = (
+            _TECH_DOC_PREAMBLE if doc_type == "technical" else _NON_TECH_DOC_PREAMBLE
+        )
+        prompt = f"{preamble}\n\nCambios:\n{content}"
 
-{content}
-
-La documentación debe incluir:
-
-1. Descripción Técnica
-   - Arquitectura y diseño implementado
-   - Patrones y principios aplicados
-   - Flujo de datos y control
-   - Dependencias y relaciones
-
-2. Impacto en el Sistema
-   - Cambios en la arquitectura
-   - Modificaciones en APIs o interfaces
-   - Efectos en el rendimiento
-   - Consideraciones de escalabilidad
-
-3. Consideraciones de Implementación
-   - Requisitos técnicos
-   - Configuración necesaria
-   - Pasos de implementación
-   - Pruebas requeridas
-
-4. Efectos Secundarios y Riesgos
-   - Posibles problemas de rendimiento
-   - Consideraciones de seguridad
-   - Impacto en otras partes del sistema
-   - Plan de mitigación de riesgos
-
-5. Mantenimiento y Evolución
-   - Recomendaciones para mantenimiento
-   - Puntos de extensión
-   - Consideraciones para futuras mejoras
-   - Métricas y monitoreo
-
-Formato: Usa markdown para estructurar la documentación, incluyendo:
-- Diagramas en formato Mermaid cuando sea relevante
-- Ejemplos de código en bloques
-- Tablas para comparaciones o configuraciones
-- Enlaces a documentación relacionada
-
-Nota: La documentación debe ser clara, concisa y útil para desarrolladores técnicos."""
-        else:
-            prompt = f"""Como consultor de negocio y tecnología, genera documentación no técnica (para stakeholders) basada en los siguientes cambios:
+        logger.info(f"Generando documentación {doc_type} para cambios")
+        return await self._make_ai_request(prompt, max_tokens=max_tokens)
 
-{content}
+    async def generate_both_documents(
+        self,
+        content: str,
+        max_tokens: int = 4096
+    ) -> tuple:
+        """
+        Genera la documentación técnica y no técnica en una sola petición.
 
-La documentación debe incluir:
+        Fusiona ambos prompts en una única generación para pagar un solo
+        round-trip y subir el diff una sola vez, separando las dos
+        secciones de la respuesta mediante centinelas.
 
-1. Resumen Ejecutivo
-   - Objetivo principal del cambio
-   - Beneficios clave
-   - Impacto en el negocio
-   - Timeline y entregables
+        Args:
+            content (str): Contenido a documentar
+            max_tokens (int): Máximo número de tokens en la respuesta
 
-2. Beneficios para el Negocio
-   - Mejoras en eficiencia
-   - Reducción de costos
-   - Nuevas capacidades
-   - Ventajas competitivas
+        Returns:
+            tuple: (documentación técnica, documentación no técnica)
 
-3. Impacto en los Usuarios
-   - Cambios en la experiencia de usuario
-   - Nuevas funcionalidades
-   - Mejoras en usabilidad
-   - Plan de adopción
+        Raises:
+            ContentTooLargeError: Si el contenido excede el límite
+            HTTPException: Si hay error en la petición
+        """
+        # Validar tamaño de contenido
+        if _count_tokens(content) > self.MAX_DIFF_TOKENS:
+            logger.warning(f"Diff demasiado grande: {len(content)} caracteres")
+            raise ContentTooLargeError(
+                f"El diff excede el límite de {self.MAX_DIFF_TOKENS} tokens"
+            )
 
-4. Consideraciones Estratégicas
-   - Alineación con objetivos de negocio
-   - Riesgos y mitigación
-   - Oportunidades futuras
-   - Recursos necesarios
+        prompt = f"{_BOTH_DOCS_PREAMBLE}\n\nCambios:\n{content}"
 
-5. Próximos Pasos
-   - Plan de implementación
-   - Roles y responsabilidades
-   - Métricas de éxito
-   - Timeline y hitos
+        logger.info("Generando documentación técnica y no técnica en una petición")
+        result = await self._make_ai_request(prompt, max_tokens=max_tokens)
 
-Formato: Usa markdown para estructurar la documentación, incluyendo:
-- Gráficos o diagramas cuando sea relevante
-- Puntos clave resaltados
-- Ejemplos prácticos
-- Métricas y KPIs
+        # Separar las secciones con str.partition (un escaneo en C por
+        # centinela, sin maquinaria de regex)
+        _, _, rest = result.partition("[TECH]")
+        tech_doc, tech_found, rest = rest.partition("[/TECH]")
+        _, _, rest = rest.partition("[NONTECH]")
+        non_tech_doc, non_tech_found, _ = rest.partition("[/NONTECH]")
 
-Nota: La documentación debe ser clara y accesible para stakeholders no técnicos, evitando jerga técnica innecesaria."""
+        if not tech_found or not non_tech_found:
+            # La respuesta no respetó los delimitadores: volver a las dos
+            # generaciones independientes (en paralelo) como plan B
+            logger.warning("Respuesta combinada sin delimitadores; regenerando por separado")
+            return tuple(await asyncio.gather(
+                self.generate_document(content, "technical"),
+                self.generate_document(content, "non-technical")
+            ))
 
-        logger.info(f"Generando documentación {doc_type} para cambios")
-        return await self._make_ai_request(prompt, max_tokens=max_tokens) 
\ No newline at end of file
+        return tech_doc.strip(), non_tech_doc.strip() 
\ No newline at end of file
@@ -4,11 +4,12 @@ Proporciona funcionalidades para validar webhooks, obtener información de PRs
 y manejar eventos de GitHub de forma segura.
 """
 
+import asyncio
 import hmac
-import hashlib
-import json
-from typing import Dict, Any, Optional, List
-import requests
+import os
+from typing import Dict, Any, List, Optional
+import httpx
+import orjson
 from utils.logger import setup_logger
 
 logger = setup_logger("github_service")
@@ -16,7 +17,7 @@ logger = setup_logger("github_service")
 class GitHubService:
     """
     Servicio para interactuar con la API de GitHub.
-    
+
     Attributes:
         webhook_secret (str): Secreto para validar webhooks
         api_token (str): Token de acceso personal de GitHub
@@ -27,7 +28,9 @@ class GitHubService:
         self,
         webhook_secret: str,
         api_token: str,
-        base_url: str = "https://api.github.com"
+        base_url: str = "https://api.github.com",
+        repo: Optional[str] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None
     ):
         """
         Inicializa el servicio de GitHub.
@@ -36,16 +39,49 @@ class GitHubService:
             webhook_secret (str): Secreto para validar webhooks
             api_token (str): Token de acceso personal de GitHub
             base_url (str): URL base de la API de GitHub
+            repo (Optional[str]): Repositorio "owner/nombre"; si no se
+                proporciona, se busca en variables de entorno
+            transport (Optional[httpx.AsyncBaseTransport]): Transporte HTTP
+                alternativo; lo usan los tests para inyectar MockTransport
         """
         self.webhook_secret = webhook_secret
+        # Secreto precodificado una sola vez para la verificación HMAC
+        self._secret_bytes = webhook_secret.encode() if webhook_secret else b""
         self.api_token = api_token
         self.base_url = base_url.rstrip("/")
+        # Repo y prefijos de URL resueltos una sola vez: evita un os.getenv
+        # y varias f-strings largas por petición. main.py pasa el repo desde
+        # settings; el fallback a os.getenv solo cubre construcción directa
+        self.repo = repo or os.getenv("GITHUB_REPO")
+        self._pulls_prefix = f"{self.base_url}/repos/{self.repo}/pulls/"
+        self._issues_prefix = f"{self.base_url}/repos/{self.repo}/issues/"
         self.headers = {
             "Authorization": f"token {api_token}",
-            "Accept": "application/vnd.github.v3+json"
+            "Accept": "application/vnd.github.v3+json",
+            # Los cuerpos se serializan con orjson, así que el Content-Type
+            # se declara aquí en vez de dejarlo al encoder de httpx
+            "Content-Type": "application/json"
         }
+        # Cliente HTTP asíncrono compartido entre todas las peticiones, con
+        # pool de conexiones keep-alive para no pagar un handshake TCP+TLS
+        # por llamada
+        self._client = httpx.AsyncClient(
+            headers=self.headers,
+            timeout=30.0,
+            # El transporte reintenta hasta 3 veces los fallos de conexión;
+            # los reintentos por código de estado quedan en el llamador
+            transport=transport or httpx.AsyncHTTPTransport(
+                retries=3,
+                http2=True,
+                limits=httpx.Limits(max_keepalive_connections=10, max_connections=20)
+            )
+        )
         logger.info("GitHubService inicializado")
 
+    async def aclose(self) -> None:
+        """Cierra el cliente HTTP asíncrono."""
+        await self._client.aclose()
+
     def verify_webhook_signature(
         self,
         payload_body: bytes,
@@ -65,30 +101,37 @@ class GitHubService:
             logger.warning("No se proporcionó firma en el webhook")
             return False
 
+        if not signature_header.startswith("sha256="):
+            logger.warning("Firma de webhook con formato inválido")
+            return False
+
         try:
-            expected_signature = hmac.new(
-                self.webhook_secret.encode(),
+            # Comparar digests crudos (32 bytes): sin formateo hex y con la
+            # mitad de bytes en la comparación de tiempo constante.
+            # hmac.digest es la variante one-shot acelerada en C: no construye
+            # el objeto HMAC de Python ni re-encodea el secreto por llamada
+            received_digest = bytes.fromhex(signature_header.removeprefix("sha256="))
+            expected_digest = hmac.digest(
+                self._secret_bytes,
                 payload_body,
-                hashlib.sha256
-            ).hexdigest()
-            
-            received_signature = signature_header.replace("sha256=", "")
-            
+                "sha256"
+            )
+
             is_valid = hmac.compare_digest(
-                expected_signature,
-                received_signature
+                expected_digest,
+                received_digest
             )
-            
+
             if not is_valid:
                 logger.warning("Firma de webhook inválida")
-            
+
             return is_valid
-            
+
         except Exception as e:
             logger.error(f"Error al verificar firma: {str(e)}")
             return False
 
-    def get_pull_request(
+    async def get_pull_request(
         self,
         owner: str,
         repo: str,
@@ -106,20 +149,20 @@ class GitHubService:
             Dict[str, Any]: Información del PR
 
         Raises:
-            requests.RequestException: Si hay error en la petición
+            httpx.HTTPError: Si hay error en la petición
         """
         url = f"{self.base_url}/repos/{owner}/{repo}/pulls/{pr_number}"
-        
+
         try:
-            response = requests.get(url, headers=self.headers)
+            response = await self._client.get(url)
             response.raise_for_status()
-            return response.json()
-            
-        except requests.RequestException as e:
+            return orjson.loads(response.content)
+
+        except httpx.HTTPError as e:
             logger.error(f"Error al obtener PR #{pr_number}: {str(e)}")
             raise
 
-    def get_pr_files(
+    async def get_pr_files(
         self,
         owner: str,
         repo: str,
@@ -137,20 +180,20 @@ class GitHubService:
             List[Dict[str, Any]]: Lista de archivos modificados
 
         Raises:
-            requests.RequestException: Si hay error en la petición
+            httpx.HTTPError: Si hay error en la petición
         """
         url = f"{self.base_url}/repos/{owner}/{repo}/pulls/{pr_number}/files"
-        
+
         try:
-            response = requests.get(url, headers=self.headers)
+            response = await self._client.get(url)
             response.raise_for_status()
-            return response.json()
-            
-        except requests.RequestException as e:
+            return orjson.loads(response.content)
+
+        except httpx.HTTPError as e:
             logger.error(f"Error al obtener archivos del PR #{pr_number}: {str(e)}")
             raise
 
-    def create_pr_comment(
+    async def create_pr_comment(
         self,
         owner: str,
         repo: str,
@@ -170,48 +213,66 @@ class GitHubService:
             Dict[str, Any]: Respuesta de la API
 
         Raises:
-            requests.RequestException: Si hay error en la petición
+            httpx.HTTPError: Si hay error en la petición
         """
         url = f"{self.base_url}/repos/{owner}/{repo}/issues/{pr_number}/comments"
-        
+
         try:
-            response = requests.post(
-                url,
-                headers=self.headers,
-                json={"body": comment}
-            )
+            response = await self._client.post(url, content=orjson.dumps({"body": comment}))
             response.raise_for_status()
-            return response.json()
-            
-        except requests.RequestException as e:
+            return orjson.loads(response.content)
+
+        except httpx.HTTPError as e:
             logger.error(f"Error al crear comentario en PR #{pr_number}: {str(e)}")
             raise
 
     async def get_pr_diff(self, pr_number: int) -> str:
-        """Obtiene el diff de un Pull Request."""
-        repo = os.getenv("GITHUB_REPO")
-        url = f"{self.base_url}/repos/{repo}/pulls/{pr_number}"
-        
-        response = requests.get(url, headers=self.headers)
+        """
+        Obtiene el diff de un Pull Request.
+
+        Pide el diff directamente al endpoint del PR con el media type
+        de diff, en vez de descargar el JSON completo para extraer
+        diff_url y hacer una segunda petición.
+        """
+        response = await self._client.get(
+            f"{self._pulls_prefix}{pr_number}",
+            headers={"Accept": "application/vnd.github.v3.diff"}
+        )
         response.raise_for_status()
-        
-        return response.json().get("diff_url")
-    
+
+        return response.text
+
     async def add_pr_comment(self, pr_number: int, comment: str) -> None:
         """Añade un comentario a un Pull Request."""
-        repo = os.getenv("GITHUB_REPO")
-        url = f"{self.base_url}/repos/{repo}/issues/{pr_number}/comments"
-        
-        data = {"body": comment}
-        response = requests.post(url, headers=self.headers, json=data)
+        url = f"{self._issues_prefix}{pr_number}/comments"
+
+        response = await self._client.post(url, content=orjson.dumps({"body": comment}))
         response.raise_for_status()
-    
+
     async def get_pr_details(self, pr_number: int) -> dict:
         """Obtiene los detalles de un Pull Request."""
-        repo = os.getenv("GITHUB_REPO")
-        url = f"{self.base_url}/repos/{repo}/pulls/{pr_number}"
-        
-        response = requests.get(url, headers=self.headers)
+        response = await self._client.get(f"{self._pulls_prefix}{pr_number}")
         response.raise_for_status()
-        
-        return response.json() 
\ No newline at end of file
+
+        return orjson.loads(response.content)
+
+    async def fetch_pr_bundle(self, pr_number: int) -> tuple:
+        """
+        Obtiene detalles, diff y archivos de un PR en paralelo.
+
+        Las tres peticiones son independientes, así que se lanzan con
+        asyncio.gather y la latencia total es la de la más lenta.
+
+        Args:
+            pr_number (int): Número del PR
+
+        Returns:
+            tuple: (detalles, diff, lista de archivos)
+        """
+        owner, _, name = (self.repo or "").partition("/")
+        details, diff, files = await asyncio.gather(
+            self.get_pr_details(pr_number),
+            self.get_pr_diff(pr_number),
+            self.get_pr_files(owner, name, pr_number)
+        )
+        return details, diff, files
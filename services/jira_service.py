@@ -4,17 +4,35 @@ Proporciona funcionalidades para crear y actualizar issues, comentarios
 y manejar la integración con GitHub de forma segura.
 """
 
-import json
+import time
 from typing import Dict, Any, Optional, List
-import requests
+import httpx
+import orjson
 from utils.logger import setup_logger
 
 logger = setup_logger("jira_service")
 
+def _adf(text: str) -> Dict[str, Any]:
+    """
+    Construye un documento ADF (Atlassian Document Format) mínimo con un
+    único párrafo de texto. Centraliza el esqueleto anidado que antes se
+    repetía como literal en cada método.
+    """
+    return {
+        "type": "doc",
+        "version": 1,
+        "content": [
+            {
+                "type": "paragraph",
+                "content": [{"type": "text", "text": text}]
+            }
+        ]
+    }
+
 class JiraService:
     """
     Servicio para interactuar con la API de Jira Cloud.
-    
+
     Attributes:
         base_url (str): URL base de la API de Jira
         email (str): Email de la cuenta de Jira
@@ -27,7 +45,8 @@ class JiraService:
         base_url: str,
         email: str,
         api_token: str,
-        project_key: str
+        project_key: str,
+        transport: Optional[httpx.AsyncBaseTransport] = None
     ):
         """
         Inicializa el servicio de Jira.
@@ -37,21 +56,48 @@ class JiraService:
             email (str): Email de la cuenta de Jira
             api_token (str): Token de API de Jira
             project_key (str): Clave del proyecto en Jira
+            transport (Optional[httpx.AsyncBaseTransport]): Transporte HTTP
+                alternativo; lo usan los tests para inyectar MockTransport
         """
         self.base_url = base_url.rstrip("/")
         self.email = email
         self.api_token = api_token
         self.project_key = project_key
-        
+
         self.headers = {
             "Accept": "application/json",
             "Content-Type": "application/json"
         }
-        
+
         self.auth = (email, api_token)
+        # Prefijo de URL de issues precalculado una sola vez
+        self._issue_prefix = f"{self.base_url}/rest/api/3/issue"
+        # Cache de transiciones por proyecto: {proyecto: (expira, {nombre: id})}.
+        # Las transiciones de un workflow cambian rara vez, así que cachearlas
+        # ahorra un GET completo antes de cada POST de transición
+        self._transition_cache: Dict[str, tuple] = {}
+        self._transition_cache_ttl = 300.0
+        # Cliente HTTP asíncrono compartido; la autenticación y los headers
+        # se configuran una sola vez aquí
+        self._client = httpx.AsyncClient(
+            headers=self.headers,
+            auth=self.auth,
+            timeout=30.0,
+            # El transporte reintenta hasta 3 veces los fallos de conexión;
+            # los reintentos por código de estado quedan en el llamador
+            transport=transport or httpx.AsyncHTTPTransport(
+                retries=3,
+                http2=True,
+                limits=httpx.Limits(max_keepalive_connections=10, max_connections=20)
+            )
+        )
         logger.info("JiraService inicializado")
 
-    def create_issue(
+    async def aclose(self) -> None:
+        """Cierra el cliente HTTP asíncrono."""
+        await self._client.aclose()
+
+    async def create_issue(
         self,
         summary: str,
         description: str,
@@ -71,46 +117,32 @@ class JiraService:
             Dict[str, Any]: Información del issue creado
 
         Raises:
-            requests.RequestException: Si hay error en la petición
+            httpx.HTTPError: Si hay error en la petición
         """
-        url = f"{self.base_url}/rest/api/3/issue"
-        
+        url = self._issue_prefix
+
         payload = {
             "fields": {
                 "project": {"key": self.project_key},
                 "summary": summary,
-                "description": {
-                    "type": "doc",
-                    "version": 1,
-                    "content": [
-                        {
-                            "type": "paragraph",
-                            "content": [{"type": "text", "text": description}]
-                        }
-                    ]
-                },
+                "description": _adf(description),
                 "issuetype": {"name": issue_type}
             }
         }
-        
+
         if labels:
             payload["fields"]["labels"] = labels
 
         try:
-            response = requests.post(
-                url,
-                headers=self.headers,
-                auth=self.auth,
-                json=payload
-            )
+            response = await self._client.post(url, content=orjson.dumps(payload))
             response.raise_for_status()
-            return response.json()
-            
-        except requests.RequestException as e:
+            return orjson.loads(response.content)
+
+        except httpx.HTTPError as e:
             logger.error(f"Error al crear issue: {str(e)}")
             raise
 
-    def add_comment(
+    async def add_comment(
         self,
         issue_key: str,
         comment: str
@@ -126,38 +158,22 @@ class JiraService:
             Dict[str, Any]: Respuesta de la API
 
         Raises:
-            requests.RequestException: Si hay error en la petición
+            httpx.HTTPError: Si hay error en la petición
         """
-        url = f"{self.base_url}/rest/api/3/issue/{issue_key}/comment"
-        
-        payload = {
-            "body": {
-                "type": "doc",
-                "version": 1,
-                "content": [
-                    {
-                        "type": "paragraph",
-                        "content": [{"type": "text", "text": comment}]
-                    }
-                ]
-            }
-        }
+        url = f"{self._issue_prefix}/{issue_key}/comment"
+
+        payload = {"body": _adf(comment)}
 
         try:
-            response = requests.post(
-                url,
-                headers=self.headers,
-                auth=self.auth,
-                json=payload
-            )
+            response = await self._client.post(url, content=orjson.dumps(payload))
             response.raise_for_status()
-            return response.json()
-            
-        except requests.RequestException as e:
+            return orjson.loads(response.content)
+
+        except httpx.HTTPError as e:
             logger.error(f"Error al agregar comentario a {issue_key}: {str(e)}")
             raise
 
-    def update_issue_status(
+    async def update_issue_status(
         self,
         issue_key: str,
         status_id: str
@@ -173,29 +189,138 @@ class JiraService:
             Dict[str, Any]: Respuesta de la API
 
         Raises:
-            requests.RequestException: Si hay error en la petición
+            httpx.HTTPError: Si hay error en la petición
         """
-        url = f"{self.base_url}/rest/api/3/issue/{issue_key}/transitions"
-        
+        url = f"{self._issue_prefix}/{issue_key}/transitions"
+
         payload = {
             "transition": {"id": status_id}
         }
 
         try:
-            response = requests.post(
-                url,
-                headers=self.headers,
-                auth=self.auth,
-                json=payload
-            )
+            response = await self._client.post(url, content=orjson.dumps(payload))
             response.raise_for_status()
-            return response.json()
-            
-        except requests.RequestException as e:
+            return orjson.loads(response.content)
+
+        except httpx.HTTPError as e:
             logger.error(f"Error al actualizar estado de {issue_key}: {str(e)}")
             raise
 
-    def get_issue(self, issue_key: str) -> Dict[str, Any]:
+    async def get_issue_transitions(self, issue_key: str) -> List[Dict[str, Any]]:
+        """
+        Obtiene las transiciones disponibles para un issue.
+
+        Args:
+            issue_key (str): Clave del issue
+
+        Returns:
+            List[Dict[str, Any]]: Lista de transiciones disponibles
+
+        Raises:
+            httpx.HTTPError: Si hay error en la petición
+        """
+        url = f"{self._issue_prefix}/{issue_key}/transitions"
+
+        try:
+            response = await self._client.get(url)
+            response.raise_for_status()
+            return orjson.loads(response.content).get("transitions", [])
+
+        except httpx.HTTPError as e:
+            logger.error(f"Error al obtener transiciones de {issue_key}: {str(e)}")
+            raise
+
+    async def _resolve_transition_id(
+        self,
+        issue_key: str,
+        status_name: str
+    ) -> str:
+        """
+        Resuelve el ID de una transición por nombre, usando el cache
+        por proyecto cuando no ha expirado.
+        """
+        project = issue_key.partition("-")[0]
+        name_lower = status_name.lower()
+
+        cached = self._transition_cache.get(project)
+        if cached is not None and cached[0] > time.monotonic():
+            transition_id = cached[1].get(name_lower)
+            if transition_id is not None:
+                return transition_id
+
+        transitions = await self.get_issue_transitions(issue_key)
+        by_name = {
+            t["name"].lower(): t["id"]
+            for t in transitions
+            if "name" in t and "id" in t
+        }
+        self._transition_cache[project] = (
+            time.monotonic() + self._transition_cache_ttl,
+            by_name
+        )
+
+        transition_id = by_name.get(name_lower)
+        if transition_id is None:
+            raise ValueError(
+                f"No se encontró la transición '{status_name}' "
+                f"para la tarea {issue_key}"
+            )
+        return transition_id
+
+    async def transition_issue(
+        self,
+        issue_key: str,
+        status_name: str
+    ) -> None:
+        """
+        Transiciona un issue al estado indicado por nombre.
+
+        El mapeo nombre → ID de transición se cachea por proyecto con un
+        TTL corto; si Jira rechaza el ID (cache obsoleto tras un cambio
+        de workflow), se invalida el cache y se reintenta una vez.
+
+        Args:
+            issue_key (str): Clave del issue
+            status_name (str): Nombre del estado destino (ej: "In Progress")
+
+        Raises:
+            ValueError: Si no existe una transición con ese nombre
+            httpx.HTTPError: Si hay error en la petición
+        """
+        url = f"{self._issue_prefix}/{issue_key}/transitions"
+
+        for attempt in range(2):
+            transition_id = await self._resolve_transition_id(
+                issue_key, status_name
+            )
+            payload = {"transition": {"id": transition_id}}
+
+            try:
+                response = await self._client.post(url, content=orjson.dumps(payload))
+                response.raise_for_status()
+                return
+
+            except httpx.HTTPStatusError as e:
+                status = e.response.status_code
+                if attempt == 0 and status in (400, 409):
+                    # ID probablemente obsoleto: invalidar y reintentar
+                    self._transition_cache.pop(
+                        issue_key.partition("-")[0], None
+                    )
+                    continue
+                logger.error(
+                    f"Error al transicionar {issue_key} a "
+                    f"'{status_name}': {str(e)}"
+                )
+                raise
+            except httpx.HTTPError as e:
+                logger.error(
+                    f"Error al transicionar {issue_key} a "
+                    f"'{status_name}': {str(e)}"
+                )
+                raise
+
+    async def get_issue(self, issue_key: str) -> Dict[str, Any]:
         """
         Obtiene información detallada de un issue.
 
@@ -206,24 +331,20 @@ class JiraService:
             Dict[str, Any]: Información del issue
 
         Raises:
-            requests.RequestException: Si hay error en la petición
+            httpx.HTTPError: Si hay error en la petición
         """
-        url = f"{self.base_url}/rest/api/3/issue/{issue_key}"
-        
+        url = f"{self._issue_prefix}/{issue_key}"
+
         try:
-            response = requests.get(
-                url,
-                headers=self.headers,
-                auth=self.auth
-            )
+            response = await self._client.get(url)
             response.raise_for_status()
-            return response.json()
-            
-        except requests.RequestException as e:
+            return orjson.loads(response.content)
+
+        except httpx.HTTPError as e:
             logger.error(f"Error al obtener issue {issue_key}: {str(e)}")
             raise
 
-    def get_projects(self) -> List[Dict[str, Any]]:
+    async def get_projects(self) -> List[Dict[str, Any]]:
         """
         Obtiene la lista de proyectos activos de Jira.
 
@@ -231,18 +352,14 @@ class JiraService:
             List[Dict[str, Any]]: Lista de proyectos
 
         Raises:
-            requests.RequestException: Si hay error en la petición
+            httpx.HTTPError: Si hay error en la petición
         """
         url = f"{self.base_url}/rest/api/3/project/search?status=live"
         try:
-            response = requests.get(
-                url,
-                headers=self.headers,
-                auth=self.auth
-            )
+            response = await self._client.get(url)
             response.raise_for_status()
-            data = response.json()
+            data = orjson.loads(response.content)
             return data.get("values", data)  # Puede ser 'values' o lista directa
-        except requests.RequestException as e:
+        except httpx.HTTPError as e:
             logger.error(f"Error al obtener proyectos de Jira: {str(e)}")
-            raise 
\ No newline at end of file
+            raise
@@ -1,30 +1,102 @@
+import os
+
+# Entorno de prueba fijado una sola vez para todo el proceso, antes de
+# importar main (config.Settings lee estas variables al importarse). Evita
+# el patch.dict por fixture, que copiaba os.environ entero en cada test.
+_TEST_ENV = {
+    "GITHUB_TOKEN": "test_token",
+    "GITHUB_REPO": "test/repo",
+    "GITHUB_WEBHOOK_SECRET": "test_secret",
+    "JIRA_BASE_URL": "https://test.atlassian.net",
+    "JIRA_EMAIL": "test@example.com",
+    "JIRA_API_TOKEN": "test_token",
+    "JIRA_PROJECT_KEY": "TEST",
+    "VERCEL_AI_API_KEY": "test_token",
+}
+for _key, _value in _TEST_ENV.items():
+    os.environ.setdefault(_key, _value)
+
 import pytest
 from fastapi.testclient import TestClient
 from main import app
-from unittest.mock import MagicMock
 
-@pytest.fixture
+class FakeGitHubService:
+    """Fake ligero de GitHubService con respuestas enlatadas.
+
+    A diferencia de MagicMock, no crea atributos dinámicos por acceso:
+    las llamadas son métodos Python normales, mucho más baratos por test.
+    """
+
+    def verify_webhook_signature(self, payload_body, signature_header):
+        return True
+
+    async def get_pr_details(self, pr_number):
+        return {"number": pr_number, "title": "PROJ-123 Test PR", "merged": False}
+
+    async def get_pr_diff(self, pr_number):
+        return "diff --git a/file.py b/file.py\n@@ -1 +1 @@\n-old\n+new\n"
+
+    async def add_pr_comment(self, pr_number, comment):
+        return None
+
+class FakeJiraService:
+    """Fake ligero de JiraService con respuestas enlatadas."""
+
+    async def create_issue(self, summary, description, issue_type="Task", labels=None):
+        return {"key": "PROJ-123", "id": "10000"}
+
+    async def add_comment(self, issue_key, comment):
+        return {"id": "20000"}
+
+    async def get_issue_transitions(self, issue_key):
+        return [
+            {"id": "21", "name": "In Progress"},
+            {"id": "31", "name": "In Review"},
+            {"id": "41", "name": "Completed"},
+        ]
+
+    async def transition_issue(self, issue_key, status_name):
+        return None
+
+class FakeAIService:
+    """Fake ligero de AIService con respuestas enlatadas."""
+
+    async def generate_pr_feedback(self, description, title, max_tokens=1024):
+        return "Feedback generado"
+
+    async def generate_document(self, content, doc_type, max_tokens=4096):
+        return "Documento generado"
+
+    async def generate_both_documents(self, content, max_tokens=4096):
+        return "Documento técnico", "Documento no técnico"
+
+@pytest.fixture(scope="session")
 def client():
-    """Fixture que proporciona un cliente de prueba de FastAPI."""
-    return TestClient(app)
+    """Fixture que proporciona un cliente de prueba de FastAPI.
+
+    El bloque with ejecuta el lifespan ASGI (startup/shutdown) una sola
+    vez por sesión en lugar de una vez por test.
+    """
+    with TestClient(app) as c:
+        yield c
 
 @pytest.fixture
 def mock_github_service(monkeypatch):
-    """Fixture que proporciona un mock del servicio de GitHub."""
-    mock = MagicMock()
-    monkeypatch.setattr("services.github_service.GitHubService", lambda: mock)
-    return mock
+    """Fixture que sustituye el servicio de GitHub por un fake."""
+    fake = FakeGitHubService()
+    monkeypatch.setattr("main.github_service", fake)
+    return fake
 
 @pytest.fixture
 def mock_jira_service(monkeypatch):
-    """Fixture que proporciona un mock del servicio de Jira."""
-    mock = MagicMock()
-    monkeypatch.setattr("services.jira_service.JiraService", lambda: mock)
-    return mock
+    """Fixture que sustituye el servicio de Jira por un fake."""
+    fake = FakeJiraService()
+    monkeypatch.setattr("main.jira_service", fake)
+    return fake
 
 @pytest.fixture
 def mock_ai_service(monkeypatch):
-    """Fixture que proporciona un mock del servicio de IA."""
-    mock = MagicMock()
-    monkeypatch.setattr("services.ai_service.AIService", lambda: mock)
-    return mock 
\ No newline at end of file
+    """Fixture que sustituye el servicio de IA por un fake."""
+    fake = FakeAIService()
+    monkeypatch.setattr("main.ai_service", fake)
+    return fake
@@ -1,135 +1,70 @@
+import orjson
 import pytest
-from services.ai_service import AIService
-from unittest.mock import patch, MagicMock
+import httpx
+from services.ai_service import (
+    AIService,
+    _PR_FEEDBACK_PREAMBLE,
+    _TECH_DOC_PREAMBLE,
+    _NON_TECH_DOC_PREAMBLE,
+)
 
-@pytest.fixture
-def ai_service():
-    """Fixture que proporciona una instancia del servicio de IA."""
-    with patch.dict("os.environ", {
-        "VERCEL_AI_API_KEY": "test_token"
-    }):
-        return AIService()
-
-def test_generate_pr_feedback(ai_service):
-    """Prueba el método generate_pr_feedback."""
-    # Configurar el mock
-    mock_response = MagicMock()
-    mock_response.json.return_value = {
-        "text": "Test feedback"
-    }
-    mock_response.raise_for_status.return_value = None
-    
-    with patch("requests.post", return_value=mock_response) as mock_post:
-        # Llamar al método
-        result = ai_service.generate_pr_feedback(
-            "Test description",
-            "Test PR"
-        )
-        
-        # Verificar la llamada
-        mock_post.assert_called_once_with(
-            "https://api.vercel.com/v1/ai/generate",
-            headers={
-                "Authorization": "Bearer test_token",
-                "Content-Type": "application/json"
-            },
-            json={
-                "prompt": """Analiza el siguiente Pull Request y proporciona feedback constructivo:
-
-Título: Test PR
-Descripción: Test description
-
-Por favor, proporciona:
-1. Un resumen de los cambios
-2. Puntos positivos
-3. Sugerencias de mejora
-4. Preguntas o dudas que tengas
+# Handler programable por test: el MockTransport se construye una sola
+# vez por módulo y cada test solo cambia esta función
+_handler = {"respond": None}
+_transport = httpx.MockTransport(lambda request: _handler["respond"](request))
 
-Formato: Usa markdown para estructurar tu respuesta."""
-            }
-        )
-        
-        # Verificar el resultado
-        assert result == "Test feedback"
-
-def test_generate_document_technical(ai_service):
-    """Prueba el método generate_document para documentación técnica."""
-    # Configurar el mock
-    mock_response = MagicMock()
-    mock_response.json.return_value = {
-        "text": "Test technical doc"
-    }
-    mock_response.raise_for_status.return_value = None
-    
-    with patch("requests.post", return_value=mock_response) as mock_post:
-        # Llamar al método
-        result = ai_service.generate_document(
-            "Test diff",
-            "technical"
-        )
-        
-        # Verificar la llamada
-        mock_post.assert_called_once_with(
-            "https://api.vercel.com/v1/ai/generate",
-            headers={
-                "Authorization": "Bearer test_token",
-                "Content-Type": "application/json"
-            },
-            json={
-                "prompt": """Genera documentación técnica detallada basada en los siguientes cambios de código:
-
-Test diff
+@pytest.fixture(scope="module")
+def ai_service():
+    """Fixture que proporciona una instancia del servicio de IA.
 
-La documentación debe incluir:
-1. Descripción técnica de los cambios
-2. Impacto en el sistema
-3. Consideraciones de implementación
-4. Posibles efectos secundarios
+    El entorno de prueba lo fija conftest.py una vez por proceso.
+    """
+    return AIService(transport=_transport)
 
-Formato: Usa markdown para estructurar la documentación."""
-            }
-        )
-        
-        # Verificar el resultado
-        assert result == "Test technical doc"
+@pytest.mark.parametrize(
+    "method,args,preamble,fragments,mock_text",
+    [
+        (
+            "generate_pr_feedback",
+            ("Test description", "Test PR"),
+            _PR_FEEDBACK_PREAMBLE,
+            ["Título: Test PR", "Descripción: Test description"],
+            "Test feedback",
+        ),
+        (
+            "generate_document",
+            ("Test diff tech", "technical"),
+            _TECH_DOC_PREAMBLE,
+            ["Test diff tech"],
+            "Test technical doc",
+        ),
+        (
+            "generate_document",
+            ("Test diff non tech", "non-technical"),
+            _NON_TECH_DOC_PREAMBLE,
+            ["Test diff non tech"],
+            "Test non-technical doc",
+        ),
+    ],
+)
+async def test_generation_prompts(ai_service, method, args, preamble, fragments, mock_text):
+    """Prueba los prompts de generate_pr_feedback y generate_document."""
+    requests_seen = []
 
-def test_generate_document_non_technical(ai_service):
-    """Prueba el método generate_document para documentación no técnica."""
-    # Configurar el mock
-    mock_response = MagicMock()
-    mock_response.json.return_value = {
-        "text": "Test non-technical doc"
-    }
-    mock_response.raise_for_status.return_value = None
-    
-    with patch("requests.post", return_value=mock_response) as mock_post:
-        # Llamar al método
-        result = ai_service.generate_document(
-            "Test diff",
-            "non-technical"
-        )
-        
-        # Verificar la llamada
-        mock_post.assert_called_once_with(
-            "https://api.vercel.com/v1/ai/generate",
-            headers={
-                "Authorization": "Bearer test_token",
-                "Content-Type": "application/json"
-            },
-            json={
-                "prompt": """Genera documentación no técnica (para stakeholders) basada en los siguientes cambios:
+    def respond(request):
+        requests_seen.append(request)
+        return httpx.Response(200, json={"text": mock_text}, request=request)
 
-Test diff
+    _handler["respond"] = respond
 
-La documentación debe incluir:
-1. Resumen ejecutivo de los cambios
-2. Beneficios para el negocio
-3. Impacto en los usuarios
-4. Próximos pasos o consideraciones
+    result = await getattr(ai_service, method)(*args)
 
-Formato: Usa markdown para estructurar la documentación."""
-            }
-        )
-        
-        # Verificar el resultado
-        assert result == "Test non-technical doc" 
\ No newline at end of file
+    assert result == mock_text
+    assert len(requests_seen) == 1
+    request = requests_seen[0]
+    assert request.url.path.endswith("/generate")
+    assert request.headers["Authorization"] == "Bearer test_token"
+    payload = orjson.loads(request.content)
+    assert payload["prompt"].startswith(preamble)
+    for fragment in fragments:
+        assert fragment in payload["prompt"]
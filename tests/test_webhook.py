@@ -1,60 +1,52 @@
-import pytest
-from fastapi.testclient import TestClient
 import hmac
 import hashlib
 import json
 import os
-from main import app
 
-client = TestClient(app)
+# Payload y firma calculados una sola vez al importar el módulo. Se envían
+# los mismos bytes firmados con content= para que lo que verifica el
+# servidor coincida exactamente con lo firmado, sin re-serializar.
+_PAYLOAD = {
+    "ref": "refs/heads/feature/TEST-123-test-branch",
+    "ref_type": "branch",
+}
+_PAYLOAD_BYTES = json.dumps(_PAYLOAD).encode()
+_SECRET = os.getenv("GITHUB_WEBHOOK_SECRET", "test_secret")
+_SIGNATURE = hmac.new(_SECRET.encode(), _PAYLOAD_BYTES, hashlib.sha256).hexdigest()
 
-def test_health_check():
+def test_health_check(client):
     """Prueba el endpoint de health check."""
     response = client.get("/health")
     assert response.status_code == 200
-    assert response.json() == {"status": "healthy"}
+    data = response.json()
+    assert data["status"] == "healthy"
+    assert data["services"] == {"github": "ok", "jira": "ok", "ai": "ok"}
 
-def test_github_webhook_invalid_signature():
+def test_github_webhook_invalid_signature(client):
     """Prueba el webhook con una firma inválida."""
-    payload = {
-        "ref": "refs/heads/feature/TEST-123-test-branch",
-        "ref_type": "branch"
-    }
-    
     response = client.post(
         "/github/webhook",
-        json=payload,
+        content=_PAYLOAD_BYTES,
         headers={
+            "Content-Type": "application/json",
             "X-GitHub-Event": "create",
-            "X-Hub-Signature-256": "invalid_signature"
-        }
+            "X-Hub-Signature-256": "invalid_signature",
+        },
     )
-    
+
     assert response.status_code == 401
 
-def test_github_webhook_branch_create():
+def test_github_webhook_branch_create(client, mock_jira_service):
     """Prueba la creación de una rama."""
-    payload = {
-        "ref": "refs/heads/feature/TEST-123-test-branch",
-        "ref_type": "branch"
-    }
-    
-    # Generar firma válida
-    secret = os.getenv("GITHUB_WEBHOOK_SECRET", "test_secret")
-    signature = hmac.new(
-        secret.encode(),
-        json.dumps(payload).encode(),
-        hashlib.sha256
-    ).hexdigest()
-    
     response = client.post(
         "/github/webhook",
-        json=payload,
+        content=_PAYLOAD_BYTES,
         headers={
+            "Content-Type": "application/json",
             "X-GitHub-Event": "create",
-            "X-Hub-Signature-256": f"sha256={signature}"
-        }
+            "X-Hub-Signature-256": f"sha256={_SIGNATURE}",
+        },
     )
-    
-    assert response.status_code == 200
-    assert response.json()["message"] == "Webhook processed successfully" 
\ No newline at end of file
+
+    assert response.status_code == 202
+    assert response.json()["message"] == "Webhook accepted"
@@ -0,0 +1,71 @@
+"""
+Helpers puros del hot path del webhook.
+
+Funciones de solo stdlib y completamente anotadas para que el módulo se
+pueda compilar con mypyc (``mypyc utils/fastpath.py``) en el paso de build
+y eliminar el despacho de bytecode; sin compilar funcionan igual como
+Python puro.
+"""
+
+import hashlib
+import hmac
+from typing import Optional
+
+
+def extract_jira_id(text: str) -> Optional[str]:
+    """
+    Extrae el primer ID de Jira (patrón ``[A-Z]+-\\d+``) de un texto.
+
+    Salta entre candidatos con ``str.find("-")`` (un memchr en C por
+    guion) y solo camina en Python la corrida de mayúsculas hacia atrás y
+    la de dígitos hacia delante alrededor de cada guion, en lugar de
+    visitar todos los caracteres del texto.
+
+    Args:
+        text (str): Texto del que extraer el ID
+
+    Returns:
+        Optional[str]: ID de Jira si se encuentra, None en caso contrario
+    """
+    n = len(text)
+    pos = text.find("-")
+    while pos != -1:
+        start = pos
+        while start > 0 and "A" <= text[start - 1] <= "Z":
+            start -= 1
+        if start < pos:
+            end = pos + 1
+            while end < n and "0" <= text[end] <= "9":
+                end += 1
+            if end > pos + 1:
+                return text[start:end]
+        pos = text.find("-", pos + 1)
+    return None
+
+
+def verify_signature(
+    secret: bytes,
+    payload_body: bytes,
+    signature_header: str
+) -> bool:
+    """
+    Verifica una firma de webhook HMAC-SHA256 de GitHub.
+
+    Args:
+        secret (bytes): Secreto del webhook ya codificado
+        payload_body (bytes): Cuerpo del payload en bytes
+        signature_header (str): Header X-Hub-Signature-256
+
+    Returns:
+        bool: True si la firma es válida, False en caso contrario
+    """
+    if not signature_header.startswith("sha256="):
+        return False
+
+    try:
+        provided_digest = bytes.fromhex(signature_header[7:])
+    except ValueError:
+        return False
+
+    expected_digest = hmac.new(secret, payload_body, hashlib.sha256).digest()
+    return hmac.compare_digest(expected_digest, provided_digest)
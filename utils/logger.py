@@ -4,11 +4,28 @@ Proporciona configuración flexible de logging con soporte para diferentes nivel
 formato personalizado y handlers configurables.
 """
 
+import functools
 import logging
 import sys
 from typing import Optional, Dict, Any
 from datetime import datetime
 
+# Ningún formato usa thread/process, así que ahorramos esas búsquedas
+# por cada registro emitido
+logging.logThreads = False
+logging.logProcesses = False
+logging.logMultiprocessing = False
+
+@functools.lru_cache(maxsize=16)
+def _get_formatter(fmt: str, datefmt: str) -> logging.Formatter:
+    """
+    Devuelve un Formatter compartido para (formato, formato de fecha).
+    Los Formatter son inmutables en la práctica, así que los handlers de
+    todos los loggers con el mismo formato pueden reutilizar la misma
+    instancia en vez de construir una por handler.
+    """
+    return logging.Formatter(fmt, datefmt=datefmt)
+
 class DevSyncLogger:
     """
     Logger profesional para DevSync AI.
@@ -36,9 +53,10 @@ class DevSyncLogger:
         """
         self.name = name
         self.level = level
+        # Sin %(filename)s/%(lineno)d: referenciarlos obliga a logging a
+        # recorrer la pila (findCaller) en cada registro emitido
         self.format_str = format_str or (
-            "[%(asctime)s] [%(levelname)s] [%(name)s] "
-            "[%(filename)s:%(lineno)d] - %(message)s"
+            "[%(asctime)s] [%(levelname)s] [%(name)s] - %(message)s"
         )
         self.handlers = []
         
@@ -57,7 +75,7 @@ class DevSyncLogger:
         # Handler para consola
         console_handler = logging.StreamHandler(sys.stdout)
         console_handler.setFormatter(
-            logging.Formatter(self.format_str, datefmt="%Y-%m-%d %H:%M:%S")
+            _get_formatter(self.format_str, "%Y-%m-%d %H:%M:%S")
         )
         logger.addHandler(console_handler)
         self.handlers.append(console_handler)
@@ -81,10 +99,7 @@ class DevSyncLogger:
         file_handler = logging.FileHandler(filename)
         file_handler.setLevel(level or self.level)
         file_handler.setFormatter(
-            logging.Formatter(
-                format_str or self.format_str,
-                datefmt="%Y-%m-%d %H:%M:%S"
-            )
+            _get_formatter(format_str or self.format_str, "%Y-%m-%d %H:%M:%S")
         )
         logger.addHandler(file_handler)
         self.handlers.append(file_handler)
@@ -105,10 +120,9 @@ def setup_logger(name: str = "devsync", level: int = logging.INFO):
     logger = logging.getLogger(name)
     if not logger.handlers:
         handler = logging.StreamHandler()
-        formatter = logging.Formatter(
-            "[%(asctime)s] [%(levelname)s] %(name)s: %(message)s"
+        handler.setFormatter(
+            _get_formatter("[%(asctime)s] [%(levelname)s] %(name)s: %(message)s", None)
         )
-        handler.setFormatter(formatter)
         logger.addHandler(handler)
     logger.setLevel(level)
     return logger 
\ No newline at end of file
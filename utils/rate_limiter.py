@@ -1,14 +1,12 @@
 """
 Rate Limiter profesional para FastAPI y entornos serverless.
-Implementa un sistema de rate limiting thread-safe con soporte para múltiples claves
+Implementa un token bucket thread-safe con soporte para múltiples claves
 y períodos de tiempo configurables.
 """
 
 import time
 import threading
-from collections import defaultdict
-from typing import Callable, Dict, List, Optional
-from datetime import datetime
+from typing import Callable, Dict, Optional, Tuple
 import logging
 
 logger = logging.getLogger(__name__)
@@ -16,45 +14,145 @@ logger = logging.getLogger(__name__)
 class RateLimiter:
     """
     Rate limiter configurable por clave (IP, user_id, etc).
-    Permite N requests por periodo de tiempo (segundos).
+    Permite N requests por periodo de tiempo (segundos) mediante un token
+    bucket por clave: cada chequeo son unas pocas operaciones aritméticas
+    O(1) en lugar de escanear un historial de timestamps.
     Thread-safe y optimizado para entornos serverless.
-    
+
+    Los tiempos internos usan time.monotonic(), por lo que no les afectan
+    los ajustes de reloj (NTP) y nunca retroceden.
+
+    El estado se reparte en shards (lock + dict) indexados por hash de la
+    clave, de modo que claves distintas casi nunca compiten por el mismo
+    lock bajo tráfico concurrente.
+
     Attributes:
         calls (int): Número máximo de llamadas permitidas por periodo
         period (int): Periodo de tiempo en segundos
-        storage (Dict[str, List[float]]): Almacenamiento de timestamps por clave
-        lock (threading.Lock): Lock para operaciones thread-safe
+        rate (float): Tokens repuestos por segundo
     """
 
-    def __init__(self, calls: int, period: int):
+    def __init__(self, calls: int, period: int, shards: int = 16):
         """
         Inicializa el rate limiter.
 
         Args:
             calls (int): Número máximo de llamadas permitidas por periodo
             period (int): Periodo de tiempo en segundos
+            shards (int): Número de shards de lock/almacenamiento; se
+                redondea a la siguiente potencia de dos
         """
         if calls < 1:
             raise ValueError("calls debe ser mayor que 0")
         if period < 1:
             raise ValueError("period debe ser mayor que 0")
-            
+        if shards < 1:
+            raise ValueError("shards debe ser mayor que 0")
+
         self.calls = calls
         self.period = period
-        self.storage: Dict[str, List[float]] = defaultdict(list)
-        self.lock = threading.Lock()
+        self.rate = calls / period
+        # Potencia de dos: permite indexar con una máscara en vez de módulo
+        n = 1
+        while n < shards:
+            n <<= 1
+        self._shard_mask = n - 1
+        self._shards = [
+            (threading.Lock(), {}) for _ in range(n)
+        ]  # type: list[Tuple[threading.Lock, Dict[str, Tuple[float, float]]]]
+        # Contador de operaciones por shard para el barrido oportunista de
+        # claves inactivas (ver _sweep_idle)
+        self._ops = [0] * n
+        self._ops_per_sweep = 10_000
         logger.info(f"RateLimiter inicializado: {calls} llamadas por {period} segundos")
 
-    def _clean_old_records(self, key: str, now: float) -> None:
+    def _shard(self, key: str) -> Tuple[threading.Lock, Dict[str, Tuple[float, float]]]:
+        """Devuelve el (lock, storage) del shard correspondiente a la clave."""
+        return self._shards[hash(key) & self._shard_mask]
+
+    def _sweep_idle(
+        self,
+        storage: Dict[str, Tuple[float, float]],
+        now: float
+    ) -> None:
         """
-        Limpia registros antiguos para una clave específica.
+        Elimina del shard las claves inactivas desde hace más de un periodo.
+
+        Tras un periodo completo sin actividad el bucket de una clave
+        vuelve a estar lleno, así que borrar la entrada no pierde
+        información: el estado se reconstruye idéntico si la clave vuelve.
+        Sin esto, storage crece sin límite con cada IP que haya tocado el
+        endpoint alguna vez. Debe llamarse con el lock del shard tomado.
+        """
+        stale = [
+            k for k, (_, last) in storage.items()
+            if now - last >= self.period
+        ]
+        for k in stale:
+            del storage[k]
+
+    def _refill(
+        self,
+        storage: Dict[str, Tuple[float, float]],
+        key: str,
+        now: float
+    ) -> float:
+        """
+        Calcula los tokens disponibles para una clave tras reponer por el
+        tiempo transcurrido desde el último refill.
 
         Args:
-            key (str): Clave a limpiar
-            now (float): Timestamp actual
+            storage (Dict): Dict del shard que contiene la clave
+            key (str): Clave a reponer
+            now (float): Timestamp monotónico actual
+
+        Returns:
+            float: Tokens disponibles (acotados a la capacidad)
+        """
+        tokens, last = storage.get(key, (float(self.calls), now))
+        return min(float(self.calls), tokens + (now - last) * self.rate)
+
+    def check(self, key: str) -> Tuple[bool, int, Optional[float]]:
+        """
+        Verifica y consume un token para una clave en una sola pasada.
+
+        Hace una única lectura de reloj y toma el lock una sola vez,
+        devolviendo todo lo que necesita la respuesta 429 sin volver a
+        consultar el estado.
+
+        Args:
+            key (str): Clave a verificar (ej: IP, user_id)
+
+        Returns:
+            Tuple[bool, int, Optional[float]]: (permitido, llamadas
+                restantes, segundos hasta el próximo token o None si hay
+                tokens disponibles)
         """
-        cutoff = now - self.period
-        self.storage[key] = [ts for ts in self.storage[key] if ts > cutoff]
+        now = time.monotonic()
+        shard_idx = hash(key) & self._shard_mask
+        lock, storage = self._shards[shard_idx]
+
+        with lock:
+            # Barrido oportunista cada N operaciones para acotar la memoria
+            self._ops[shard_idx] += 1
+            if self._ops[shard_idx] >= self._ops_per_sweep:
+                self._ops[shard_idx] = 0
+                self._sweep_idle(storage, now)
+
+            tokens = self._refill(storage, key, now)
+
+            if tokens >= 1.0:
+                tokens -= 1.0
+                storage[key] = (tokens, now)
+                # Guardado para no pagar el formateo de la f-string cuando
+                # DEBUG está desactivado (el caso normal en producción)
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(f"Request permitida para {key}. Tokens restantes: {tokens:.2f}")
+                return True, int(tokens), None
+
+            storage[key] = (tokens, now)
+            logger.warning(f"Rate limit excedido para {key}. Tokens disponibles: {tokens:.2f}")
+            return False, 0, (1.0 - tokens) / self.rate
 
     def is_allowed(self, key: str) -> bool:
         """
@@ -66,19 +164,7 @@ class RateLimiter:
         Returns:
             bool: True si está permitido, False si excede el límite
         """
-        now = time.time()
-        
-        with self.lock:
-            self._clean_old_records(key, now)
-            current_calls = len(self.storage[key])
-            
-            if current_calls < self.calls:
-                self.storage[key].append(now)
-                logger.debug(f"Request permitida para {key}. Llamadas actuales: {current_calls + 1}")
-                return True
-                
-            logger.warning(f"Rate limit excedido para {key}. Llamadas actuales: {current_calls}")
-            return False
+        return self.check(key)[0]
 
     def get_remaining_calls(self, key: str) -> int:
         """
@@ -90,26 +176,32 @@ class RateLimiter:
         Returns:
             int: Número de llamadas restantes
         """
-        now = time.time()
-        with self.lock:
-            self._clean_old_records(key, now)
-            return max(0, self.calls - len(self.storage[key]))
+        now = time.monotonic()
+        lock, storage = self._shard(key)
+        with lock:
+            return int(self._refill(storage, key, now))
 
     def get_reset_time(self, key: str) -> Optional[float]:
         """
-        Obtiene el tiempo hasta que se resetea el rate limit para una clave.
+        Obtiene el tiempo hasta que la clave vuelva a tener una llamada
+        disponible.
 
         Args:
             key (str): Clave a verificar
 
         Returns:
-            Optional[float]: Tiempo en segundos hasta el reset, o None si no hay registros
+            Optional[float]: Tiempo en segundos hasta el próximo token, o
+                             None si no hay registros para la clave
         """
-        with self.lock:
-            if not self.storage[key]:
+        now = time.monotonic()
+        lock, storage = self._shard(key)
+        with lock:
+            if key not in storage:
                 return None
-            oldest = min(self.storage[key])
-            return max(0, oldest + self.period - time.time())
+            tokens = self._refill(storage, key, now)
+            if tokens >= 1.0:
+                return 0.0
+            return (1.0 - tokens) / self.rate
 
     def fastapi_dependency(self, key_func: Callable) -> Callable:
         """
@@ -125,14 +217,14 @@ class RateLimiter:
 
         async def dependency(request: Request):
             key = key_func(request)
-            if not self.is_allowed(key):
-                reset_time = self.get_reset_time(key)
+            allowed, remaining, reset_in = self.check(key)
+            if not allowed:
                 raise HTTPException(
                     status_code=status.HTTP_429_TOO_MANY_REQUESTS,
                     detail={
                         "error": "Rate limit exceeded",
-                        "reset_in": f"{reset_time:.1f}s" if reset_time else None,
-                        "remaining_calls": self.get_remaining_calls(key)
+                        "reset_in": f"{reset_in:.1f}s" if reset_in else None,
+                        "remaining_calls": remaining
                     }
                 )
-        return dependency
\ No newline at end of file
+        return dependency